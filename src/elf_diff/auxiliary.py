@@ -22,12 +22,35 @@ import inspect
 import os
 import re
 from distutils import dir_util
-from typing import List, Set
+from typing import List, Tuple
 
 
-def setIntersection(l1: Set, l2: Set) -> List:
-    """Return a list that is a sorted set intersection of two sets"""
-    return sorted(list(set(l1) & set(l2)))
+def mergeSortedLists(l1: List, l2: List) -> Tuple[List, List, List]:
+    """Merge two sorted lists of unique elements into sorted lists of the elements
+    only in the first, in both and only in the second list"""
+    only_l1: List = []
+    both: List = []
+    only_l2: List = []
+    i1 = 0
+    i2 = 0
+    n1 = len(l1)
+    n2 = len(l2)
+    while i1 < n1 and i2 < n2:
+        e1 = l1[i1]
+        e2 = l2[i2]
+        if e1 == e2:
+            both.append(e1)
+            i1 += 1
+            i2 += 1
+        elif e1 < e2:
+            only_l1.append(e1)
+            i1 += 1
+        else:
+            only_l2.append(e2)
+            i2 += 1
+    only_l1.extend(l1[i1:])
+    only_l2.extend(l2[i2:])
+    return only_l1, both, only_l2
 
 
 def getDirectoryThatStoresModuleOfObj(obj: object) -> str:
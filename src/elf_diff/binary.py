@@ -24,11 +24,12 @@ from elf_diff.symbol import getSymbolType, Symbol
 from elf_diff.settings import Settings
 from elf_diff.mangling import Mangling
 from elf_diff.source_file import SourceFile
-from elf_diff.instruction_collector import InstructionCollector
+from elf_diff.instruction_collector import InstructionCollector, startDisassembly
 from elf_diff.symbol_sizes import SymbolSizes
 from elf_diff.symbol_selection import SymbolSelection
 from elf_diff.binary_file_format import determineBinaryFileFormat
 from elf_diff.symbol_extractor import SymbolExtractor
+from elf_diff.system_command import BackgroundSystemCommand
 
 import os
 from typing import Optional, Dict, List
@@ -73,9 +74,20 @@ class Binary(object):
         self.debug_info_available: bool = False
         self.source_files: Dict[int, SourceFile] = {}
         self.symbols: Dict[str, Symbol] = {}
+        self.sorted_symbol_names: List[str] = []
         self.num_symbols_dropped: int = 0
 
-        self._initSymbols()
+        # Disassembling takes by far the longest of all binutils commands.
+        # It does not depend on the symbols extracted, so it runs in the
+        # background meanwhile.
+        disassembly: Optional[BackgroundSystemCommand] = startDisassembly(
+            filename, settings.binutils
+        )
+        try:
+            self._initSymbols(disassembly)
+        finally:
+            if disassembly is not None:
+                disassembly.close()
 
     def _verifyFilename(self):
         if not self.filename:
@@ -93,6 +105,7 @@ class Binary(object):
             mangling=self._mangling,
             symbol_selection=self._symbol_selection,
             source_prefix=self._source_prefix,
+            gather_source_locations=not self._settings.skip_source_locations,
         )
         symbol_extractor.extractSymbols(self.filename)
 
@@ -102,13 +115,13 @@ class Binary(object):
 
         self.debug_info_available = symbol_extractor.debug_info_available
 
-    def _gatherSymbolInstructions(self) -> None:
+    def _gatherSymbolInstructions(
+        self, disassembly: Optional[BackgroundSystemCommand]
+    ) -> None:
         """Gather the instructions associated with a symbol"""
         instruction_collector = InstructionCollector(symbols=self.symbols)
         instruction_collector.gatherSymbolInstructions(
-            filename=self.filename,
-            file_format=self.file_format,
-            binutils=self._settings.binutils,
+            disassembly=disassembly, file_format=self.file_format
         )
 
         self.instructions_available: bool = len(instruction_collector.symbols) > 0
@@ -116,11 +129,14 @@ class Binary(object):
         if instruction_collector.n_instruction_lines == 0:
             warning(f"Unable to read assembly from binary '{self.filename}'.")
 
-    def _initSymbols(self) -> None:
+    def _initSymbols(self, disassembly: Optional[BackgroundSystemCommand]) -> None:
         """Parse symbols from the binary"""
         self._extractSymbols()
-        self._gatherSymbolInstructions()
-
-        for symbol_name_mangled in sorted(self.symbols.keys()):
-            symbol = self.symbols[symbol_name_mangled]
-            symbol.init()
+        self._gatherSymbolInstructions(disassembly)
+
+        # Symbol initialization assigns consecutive ids that end up in the
+        # generated documents. Initializing in a sorted order keeps them
+        # reproducible. The sorted names are kept for diffing binaries.
+        self.sorted_symbol_names = sorted(self.symbols.keys())
+        for symbol_name in self.sorted_symbol_names:
+            self.symbols[symbol_name].init()
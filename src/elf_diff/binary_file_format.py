@@ -22,8 +22,7 @@ from elf_diff.system_command import runSystemCommand
 from elf_diff.binutils import Binutils
 from elf_diff.error_handling import warning
 
-import re
-from typing import Optional
+from typing import Optional, List
 
 
 def determineBinaryFileFormat(filename: str, binutils: Binutils) -> Optional[str]:
@@ -34,11 +33,15 @@ def determineBinaryFileFormat(filename: str, binutils: Binutils) -> Optional[str
         )
         return None
 
-    objdump_output: str = runSystemCommand([binutils.objdump_command, "-a", filename])
-    file_format_match = re.search(r"file format\s+(\S+)", objdump_output)
+    objdump_output: str = runSystemCommand(
+        [binutils.objdump_command, "-a", filename], cache_dir=binutils.cache_dir
+    )
+    # The file format is the first token following the words 'file format'
+    _, separator, after_separator = objdump_output.partition("file format")
+    tokens: List[str] = after_separator.split(None, 1)
     file_format: Optional[str] = None
-    if file_format_match:
-        file_format = file_format_match.group(1)
+    if separator and tokens:
+        file_format = tokens[0]
         print("File format of binary %s: %s" % (filename, file_format))
     else:
         print("Unable to detect binary file format of %s" % filename)
@@ -21,7 +21,7 @@
 
 from elf_diff.binary import Binary
 from elf_diff.binary import Mangling
-from elf_diff.auxiliary import setIntersection
+from elf_diff.auxiliary import mergeSortedLists
 from elf_diff.symbol import Symbol
 from elf_diff.settings import Settings
 from elf_diff.binary_pair_settings import BinaryPairSettings
@@ -165,10 +165,7 @@ class BinaryPair(object):
         print(f"   {len(self.disappeared_symbol_names)} disappeared symbol(s)")
         print(f"   {len(self.new_symbol_names)} new symbol(s)")
 
-    def _preparePersistingSymbols(self) -> None:
-        persisting_candidates = setIntersection(
-            self.old_symbol_names, self.new_symbol_names
-        )
+    def _preparePersistingSymbols(self, persisting_candidates: List[str]) -> None:
         if not self.settings.skip_persisting_same_size:
             self.persisting_symbol_names = persisting_candidates
             return
@@ -188,15 +185,18 @@ class BinaryPair(object):
         self.old_symbol_names = set(self.old_binary.symbols.keys())
         self.new_symbol_names = set(self.new_binary.symbols.keys())
 
-        self._preparePersistingSymbols()
-
-        self.disappeared_symbol_names = sorted(
-            self.old_symbol_names - self.new_symbol_names
-        )
-        self.appeared_symbol_names = sorted(
-            self.new_symbol_names - self.old_symbol_names
+        # Both binaries provide their symbol names sorted, which allows for
+        # classifying them in a single linear pass.
+        (
+            self.disappeared_symbol_names,
+            persisting_candidates,
+            self.appeared_symbol_names,
+        ) = mergeSortedLists(
+            self.old_binary.sorted_symbol_names, self.new_binary.sorted_symbol_names
         )
 
+        self._preparePersistingSymbols(persisting_candidates)
+
     def _computeSizeChanges(self) -> None:
         """Compute the size changes of symbols from old and new binary"""
         self.analyseSymbolSizeChanges()
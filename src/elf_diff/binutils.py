@@ -26,17 +26,55 @@ import shutil
 
 
 class Binutils(object):
-    COMMANDS = ["objdump", "nm", "readelf", "size"]
+    COMMANDS = ["objdump", "nm", "readelf", "size", "cxxfilt"]
+
+    # Utilities whose executable name differs from the command name
+    EXECUTABLE_NAMES = {"cxxfilt": "c++filt"}
+
+    # Utilities that elf_diff can do without
+    OPTIONAL_COMMANDS = ["cxxfilt"]
 
     def __init__(self):
         self.objdump_command: Optional[str] = None
         self.nm_command: Optional[str] = None
         self.readelf_command: Optional[str] = None
         self.size_command: Optional[str] = None
+        self.cxxfilt_command: Optional[str] = None
+
+        self.cache_dir: Optional[str] = None
 
         self._bin_prefix: str = ""
         self.is_functional = True
 
+    @staticmethod
+    def _getExeExtensions() -> List[str]:
+        if os.name == "nt":
+            return [".exe", ""]
+        return ["", ".exe"]
+
+    def _findUtilityNextTo(self, name: str, sibling_name: str) -> None:
+        """Find a utility only in the directory of another utility, assuming the same prefix"""
+        command_name: str = name + "_command"
+        sibling_command: str = getattr(self, sibling_name + "_command")
+
+        directory, basename = os.path.split(sibling_command)
+        stem: str = os.path.splitext(basename)[0]
+        sibling_executable_name: str = Binutils.EXECUTABLE_NAMES.get(
+            sibling_name, sibling_name
+        )
+        if stem.endswith(sibling_executable_name):
+            prefix: str = stem[: -len(sibling_executable_name)]
+            executable_name: str = Binutils.EXECUTABLE_NAMES.get(name, name)
+            for exe_extension in Binutils._getExeExtensions():
+                command = os.path.join(
+                    directory, prefix + executable_name + exe_extension
+                )
+                if (os.path.isfile(command)) and (os.access(command, os.X_OK)):
+                    setattr(self, command_name, command)
+                    return
+
+        setattr(self, command_name, None)
+
     def _findUtilityInBinDir(
         self, name: str, exe_extensions: List[str]
     ) -> Optional[str]:
@@ -72,32 +110,55 @@ class Binutils(object):
                 return
             warning(f"Unable to find predefined {command_name} = {command}")
 
-        exe_extensions: List[str]
-        if os.name == "nt":
-            exe_extensions = [".exe", ""]
-        else:
-            exe_extensions = ["", ".exe"]
+        executable_name: str = Binutils.EXECUTABLE_NAMES.get(name, name)
 
-        command = self._findUtilityInBinDir(name, exe_extensions)
+        exe_extensions: List[str] = Binutils._getExeExtensions()
+
+        command = self._findUtilityInBinDir(executable_name, exe_extensions)
 
         if command is not None:
             setattr(self, command_name, command)
             return
 
-        command = self._findUtilityUsingWhich(name, exe_extensions)
+        command = self._findUtilityUsingWhich(executable_name, exe_extensions)
 
         if command is not None:
             setattr(self, command_name, command)
             return
 
-        raise Exception(f"Unnable to find {name} command")
+        if name in Binutils.OPTIONAL_COMMANDS:
+            setattr(self, command_name, None)
+            return
+
+        raise Exception(f"Unnable to find {executable_name} command")
+
+    def _initCacheDir(self, cache_dir: str) -> None:
+        """Create the cache directory, binutils output is not cached if it is unusable"""
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as e:
+            warning(f"Unable to create binutils cache directory {cache_dir}: {e}")
+            return
+
+        if not os.access(cache_dir, os.W_OK | os.X_OK):
+            warning(f"Binutils cache directory {cache_dir} is not writable")
+            return
+
+        self.cache_dir = cache_dir
 
     def initialize(
-        self, associate: Dict, bin_prefix: Optional[str], bin_dir: Optional[str]
+        self,
+        associate: Dict,
+        bin_prefix: Optional[str],
+        bin_dir: Optional[str],
+        cache_dir: Optional[str] = None,
     ):
 
         self._bin_prefix = bin_prefix or self._bin_prefix
         self._bin_dir = bin_dir
+        self.cache_dir = None
+        if cache_dir is not None:
+            self._initCacheDir(os.path.expanduser(cache_dir))
 
         for command in Binutils.COMMANDS:
             attr_name = "%s_command" % command
@@ -108,8 +169,23 @@ class Binutils(object):
         self.findUtility("readelf")
         self.findUtility("size")
 
+        # An explicitly defined nm might belong to a cross toolchain. Demangling
+        # with the c++filt of another toolchain could silently yield different
+        # names. Only use a c++filt that lives next to it, otherwise nm -C does
+        # the demangling.
+        if (associate.get("nm_command") is not None) and (
+            associate.get("cxxfilt_command") is None
+        ):
+            self._findUtilityNextTo("cxxfilt", "nm")
+        else:
+            self.findUtility("cxxfilt")
+
         print("Tools:")
         print(f"   objdump: {self.objdump_command}")
         print(f"   nm:      {self.nm_command}")
         print(f"   readelf:      {self.readelf_command}")
         print(f"   size:    {self.size_command}")
+        print(f"   c++filt: {self.cxxfilt_command}")
+
+        if self.cache_dir is not None:
+            print(f"Caching binutils output in {self.cache_dir}")
@@ -19,11 +19,11 @@
 # this program. If not, see <http://www.gnu.org/licenses/>.
 #
 from elf_diff.symbol import Symbol
-from elf_diff.system_command import runSystemCommand
+from elf_diff.system_command import BackgroundSystemCommand
 from elf_diff.binutils import Binutils
 from elf_diff.error_handling import warning
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable
 import re
 import progressbar  # type: ignore # Make mypy ignore this module
 import sys
@@ -31,6 +31,35 @@ import sys
 SOURCE_CODE_START_TAG = "...ED_SOURCE_START..."
 SOURCE_CODE_END_TAG = "...ED_SOURCE_END..."
 
+X86_RETQ_REGEX = re.compile(r"(^.*\sc3\s+)retq(.*)$")
+
+# Matches either a symbol header line or an instruction line of the objdump
+# output. Which one matched can be told by the name of the last matched group.
+OBJDUMP_LINE_REGEX = re.compile(
+    r"^(?:"
+    r"(?:0x)?[0-9A-Fa-f]+ <(?P<symbol_name>.+)>:"
+    r"|\s*[0-9A-Fa-f]+:\s*(?:\s*[0-9a-fA-F]{2})+\s+(?P<instruction>.*)"
+    r")"
+)
+
+
+def startDisassembly(
+    filename: str, binutils: Binutils
+) -> Optional[BackgroundSystemCommand]:
+    """Start disassembling a binary in the background (None if objdump is unavailable)"""
+    if binutils.objdump_command is None:
+        return None
+
+    return BackgroundSystemCommand(
+        [
+            binutils.objdump_command,
+            "-drwS",
+            "--source-comment=%s" % SOURCE_CODE_START_TAG,
+            filename,
+        ],
+        cache_dir=binutils.cache_dir,
+    )
+
 
 class InstructionCollector(object):
     def __init__(self, symbols):
@@ -38,12 +67,9 @@ class InstructionCollector(object):
 
         self.symbols: Dict[str, Symbol] = symbols
 
-        self.header_line_re = re.compile("^(0x)?[0-9A-Fa-f]+ <(.+)>:")
-        self.instruction_line_re = re.compile(
-            r"^\s*[0-9A-Fa-f]+:\s*((?:\s*[0-9a-fA-F]{2})+)\s+(.*)\s*"
-        )
         self.cur_symbol: Optional[Symbol] = None
         self.n_instruction_lines: int = 0
+        self._in_instruction_lines: bool = False
 
         self._buffered_lines: List[str] = []
 
@@ -64,8 +90,7 @@ class InstructionCollector(object):
 
     def _flushBufferedLines(self) -> None:
         if self.cur_symbol:
-            for line in self._buffered_lines:
-                self.cur_symbol.addInstructions(line)
+            self.cur_symbol.addInstructionsBulk(self._buffered_lines)
         self._buffered_lines = []
 
     def _bufferLine(self, line: str) -> None:
@@ -77,20 +102,12 @@ class InstructionCollector(object):
             self._flushBufferedLines()
             self.cur_symbol = None
 
-    def _checkSymbolHeaderLine(self, line: str) -> bool:
-        """Check a line read from a file and process it if it is a symbol header line"""
-        header_match = re.match(self.header_line_re, line)
-        if header_match:
-            if self.cur_symbol:
-                self._submitSymbol()
-
-            symbol_name_mangled: str = header_match.group(2)
-
-            if symbol_name_mangled in self.symbols.keys():
-                self.cur_symbol = self.symbols[symbol_name_mangled]
-            return True
+    def _processSymbolHeader(self, symbol_name_mangled: str) -> None:
+        """Process a symbol header line, i.e. start collecting instructions of a new symbol"""
+        if self.cur_symbol:
+            self._submitSymbol()
 
-        return False
+        self.cur_symbol = self.symbols.get(symbol_name_mangled)
 
     @staticmethod
     def _unifyX86InstructionLine(line: str) -> str:
@@ -99,15 +116,21 @@ class InstructionCollector(object):
         # both for x86_64 binaries.
         #
         # To make comparing files portable, replace the retq with ret.
-        return re.sub(r"(^.*\sc3\s+)retq(.*)$", r"\1ret\2", line)
+        if "retq" not in line:
+            # Cheap test to avoid running the regex for the vast majority of lines
+            return line
+        return X86_RETQ_REGEX.sub(r"\1ret\2", line)
 
-    def _unifyInstructionLine(self, line: str) -> str:
-        """Fixup the assembly output by objdump in a way that it
-        is the same for all versions of objdump
+    @staticmethod
+    def _getInstructionLineUnifier(
+        file_format: Optional[str],
+    ) -> Optional[Callable[[str], str]]:
+        """Get a function that fixes up the assembly output by objdump in a way that it
+        is the same for all versions of objdump (None if no fixup is required)
         """
-        if self.file_format and (self.file_format == "elf64-x86-64"):
-            return InstructionCollector._unifyX86InstructionLine(line)
-        return line
+        if file_format == "elf64-x86-64":
+            return InstructionCollector._unifyX86InstructionLine
+        return None
 
     def registerSourceLine(self, line: str) -> None:
         if line.startswith(SOURCE_CODE_START_TAG):
@@ -118,55 +141,70 @@ class InstructionCollector(object):
                 source_code_line = "%s%s" % (line, SOURCE_CODE_END_TAG)
                 self._bufferLine(source_code_line)
 
+    def _processLine(
+        self, line: str, unify_instruction_line: Optional[Callable[[str], str]]
+    ) -> None:
+        """Process a line of objdump output"""
+        # Classify lines by cheap string tests first to spare the regex engine
+        # the lines that cannot match.
+        if not line:
+            return
+
+        if line.startswith(SOURCE_CODE_START_TAG):
+            if self.cur_symbol:
+                self.registerSourceLine(line)
+            return
+
+        unified_line = (
+            line if unify_instruction_line is None else unify_instruction_line(line)
+        )
+
+        line_match = OBJDUMP_LINE_REGEX.match(unified_line)
+
+        if line_match and (line_match.lastgroup == "symbol_name"):
+            self._processSymbolHeader(line_match.group("symbol_name"))
+            self._in_instruction_lines = False
+            return
+
+        if line_match:
+            if not self._in_instruction_lines:
+                # Clean the source lines buffered so far
+                self._cleanBufferedLines()
+                self._in_instruction_lines = True
+            self.n_instruction_lines += 1
+
+        if self.cur_symbol:
+            if line_match:
+                instruction_line = line_match.group("instruction")
+                self._bufferLine(instruction_line)
+                # print("Found instruction line \'%s\'" % (unified_instruction_line))
+            else:
+                self.registerSourceLine(unified_line)
+
     def gatherSymbolInstructions(
-        self, filename: str, file_format: Optional[str], binutils: Binutils
+        self,
+        disassembly: Optional[BackgroundSystemCommand],
+        file_format: Optional[str],
     ) -> None:
-        """Gather the symbol instructions of a symbol"""
-        if binutils.objdump_command is None:
+        """Gather the symbol instructions of a symbol from a disassembly started by startDisassembly"""
+        if disassembly is None:
             warning(
                 "Binutils objdump command unavailable. Unable to collect instructions."
             )
             return
 
-        self.file_format = file_format
+        # The file format does not change while parsing. Select the matching
+        # fixup once instead of checking the file format for every line.
+        unify_instruction_line: Optional[
+            Callable[[str], str]
+        ] = InstructionCollector._getInstructionLineUnifier(file_format)
 
         print("Gathering instructions")
         sys.stdout.flush()
 
-        objdump_output: str = runSystemCommand(
-            [
-                binutils.objdump_command,
-                "-drwS",
-                "--source-comment=%s" % SOURCE_CODE_START_TAG,
-                filename,
-            ]
-        )
-
-        in_instruction_lines: bool = False
-        for line in progressbar.progressbar(objdump_output.splitlines()):
-            unified_line = self._unifyInstructionLine(line)
-
-            is_header_line: bool = self._checkSymbolHeaderLine(unified_line)
-            if is_header_line:
-                in_instruction_lines = False
-                continue
-
-            instruction_line_match = re.match(self.instruction_line_re, unified_line)
-
-            if instruction_line_match:
-                if not in_instruction_lines:
-                    # Clean the source lines buffered so far
-                    self._cleanBufferedLines()
-                    in_instruction_lines = True
-                self.n_instruction_lines += 1
-
-            if self.cur_symbol:
-                if instruction_line_match:
-                    instruction_line = instruction_line_match.group(2)
-                    self._bufferLine(instruction_line)
-                    # print("Found instruction line \'%s\'" % (unified_instruction_line))
-                else:
-                    self.registerSourceLine(unified_line)
+        self._in_instruction_lines = False
+        for line in progressbar.progressbar(disassembly.streamOutput()):
+            self._processLine(line, unify_instruction_line)
 
         if self.cur_symbol:
             self._submitSymbol()
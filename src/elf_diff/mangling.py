@@ -38,16 +38,8 @@ class Mangling(object):
             return
         with open(self._mangling_file, "r") as f:
             lines: List[str] = f.read().splitlines()
-            self._mangling = {}
-            line_id: int = 0
             # Read line pairs, first line is mangled, second line is demangled symbol
-            for line in lines:
-                if line_id == 0:
-                    mangled_symbol: str = line
-                else:
-                    demangled_symbol: str = line
-                    self._mangling[mangled_symbol] = demangled_symbol
-                line_id = (line_id + 1) % 2
+            self._mangling = dict(zip(lines[0::2], lines[1::2]))
 
             print(
                 "Mangling info of "
@@ -61,7 +53,8 @@ class Mangling(object):
         """Try to demangle a symbol"""
         if self._mangling is None:
             return symbol_name, False
-        if symbol_name in self._mangling.keys():
-            return self._mangling[symbol_name], True
+        symbol_name_demangled: Optional[str] = self._mangling.get(symbol_name)
+        if symbol_name_demangled is not None:
+            return symbol_name_demangled, True
 
         return symbol_name, False
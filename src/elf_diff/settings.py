@@ -114,6 +114,12 @@ GROUPED_PARAMETERS: Dict[str, List[Parameter]] = {
             default=False,
             is_flag=True,
         ),
+        Parameter(
+            "skip_source_locations",
+            "If this flag is provided, symbol source locations (which are quite expensive to determine for large binaries) are skipped. This also disables migrated symbol detection.",
+            default=False,
+            is_flag=True,
+        ),
         Parameter(
             "skip_persisting_same_size",
             "If this flag is provided, persisting symbols without size changes are skipped",
@@ -144,6 +150,11 @@ GROUPED_PARAMETERS: Dict[str, List[Parameter]] = {
             "A prefix that is added to binutils executables.",
             default="",
         ),
+        Parameter(
+            "binutils_cache_dir",
+            "A directory where the output of binutils is cached to speed up repeated runs on unchanged binaries, e.g. ~/.cache/elf_diff. Caching is disabled if no directory is given.",
+            default=None,
+        ),
         Parameter(
             "objdump_command",
             "Full path to the objdump untility.",
@@ -165,6 +176,12 @@ GROUPED_PARAMETERS: Dict[str, List[Parameter]] = {
             default=None,
             no_member=True,
         ),
+        Parameter(
+            "cxxfilt_command",
+            "Full path to the c++filt untility (optional, used for demangling).",
+            default=None,
+            no_member=True,
+        ),
     ],
     "Mangling": [
         Parameter(
@@ -292,10 +309,12 @@ class Settings(object):
         self.build_info: str
         self.bin_dir: str
         self.bin_prefix: str
+        self.binutils_cache_dir: str
         self.objdump_command: str
         self.nm_command: str
         self.readelf_command: str
         self.size_command: str
+        self.cxxfilt_command: str
         self.old_mangling_file: str
         self.new_mangling_file: str
         self.html_file: str
@@ -317,6 +336,7 @@ class Settings(object):
         self.similarity_threshold: float
         self.skip_symbol_similarities: bool
         self.skip_persisting_same_size: bool
+        self.skip_source_locations: bool
         self.consider_equal_sized_identical: bool
         self.skip_details: bool
         self.symbol_selection_regex: str
@@ -453,7 +473,10 @@ class Settings(object):
         # Important: To make self.bin_prefix available all other parameters
         #            must have been read from the yaml file already.
         self.binutils.initialize(
-            my_yaml, bin_prefix=self.bin_prefix, bin_dir=self.bin_dir
+            my_yaml,
+            bin_prefix=self.bin_prefix,
+            bin_dir=self.bin_dir,
+            cache_dir=self.binutils_cache_dir,
         )
 
         # Read binary pairs
@@ -502,7 +525,10 @@ class Settings(object):
         # Important: To make self.bin_prefix available the command line arguments for
         #            all other parameters must have been read from the yaml file already.
         self.binutils.initialize(
-            cmd_line_args.__dict__, bin_prefix=self.bin_prefix, bin_dir=self.bin_dir
+            cmd_line_args.__dict__,
+            bin_prefix=self.bin_prefix,
+            bin_dir=self.bin_dir,
+            cache_dir=self.binutils_cache_dir,
         )
 
         if len(cmd_line_args.binaries) == 0:
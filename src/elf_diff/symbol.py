@@ -18,7 +18,7 @@
 # You should have received a copy of the GNU General Public License along with along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 #
-from typing import List, Dict, Optional, Any, Type, Tuple
+from typing import List, Dict, Optional, Any, Type, Tuple, FrozenSet
 
 
 class Symbol(object):
@@ -26,6 +26,9 @@ class Symbol(object):
     TYPE_FUNCTION = 1
     TYPE_DATA = 2
 
+    # nm symbol types of symbols that are not stored in program memory (bss and small bss)
+    NON_PROGRAM_MEMORY_TYPES: FrozenSet[str] = frozenset(["B", "b", "S", "s"])
+
     _CONSECUTIVE_ID = 0
 
     def __init__(self, name: str, name_mangled: str, is_demangled: bool):
@@ -61,10 +64,11 @@ class Symbol(object):
         """Check wether a symbol has related assmbly instructions"""
         return len(self.instruction_lines) > 0
 
-    def addInstructions(self, instruction_line: str) -> None:
-        """Add a line of assmbly instructions"""
-        instruction_line_stripped = instruction_line.strip()
-        self.instruction_lines.append(instruction_line_stripped)
+    def addInstructionsBulk(self, instruction_lines: List[str]) -> None:
+        """Add several lines of assembly instructions at once"""
+        self.instruction_lines.extend(
+            instruction_line.strip() for instruction_line in instruction_lines
+        )
 
     def instructionsEqual(self, other):
         # type: (Symbol) -> bool
@@ -103,12 +107,7 @@ class Symbol(object):
 
     def livesInProgramMemory(self) -> bool:
         """Return True if the symbol is of a type that is stored in program memory (on a Harvard system)"""
-        return (
-            (self.type_ != "B")
-            and (self.type_ != "b")
-            and (self.type_ != "S")
-            and (self.type_ != "s")
-        )
+        return self.type_ not in Symbol.NON_PROGRAM_MEMORY_TYPES
 
 
 class CppSymbol(Symbol):
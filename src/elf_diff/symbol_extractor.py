@@ -19,17 +19,28 @@
 # this program. If not, see <http://www.gnu.org/licenses/>.
 #
 from elf_diff.symbol import Symbol
-from elf_diff.system_command import runSystemCommand
+from elf_diff.system_command import runSystemCommandRaw
 from elf_diff.mangling import Mangling
 from elf_diff.symbol_selection import SymbolSelection
 from elf_diff.binutils import Binutils
 from elf_diff.source_file import SourceFile
+from elf_diff.error_handling import warning
 
 from typing import Type, Optional, Dict, List, Tuple
 import re
 import progressbar  # type: ignore # Make mypy ignore this module
 import sys
 
+# The nm regexes are applied to the entire undecoded nm output at once (multiline
+# mode). Therefore, they must not match across line breaks (including carriage
+# returns of Windows line endings). Only the matched groups are decoded.
+NM_REGEX_MANGLED = re.compile(
+    rb"^[0-9A-Fa-f]+ ([0-9A-Fa-f]+) (\w) ([^\t\r\n]+)(\t([^\r\n]+))?", re.MULTILINE
+)
+NM_REGEX_DEMANGLED = re.compile(
+    rb"^[0-9A-Fa-f]+ ([0-9A-Fa-f]+) (\w) ([^\r\n]+)", re.MULTILINE
+)
+
 
 class SymbolExtractor(object):
     def __init__(
@@ -39,12 +50,15 @@ class SymbolExtractor(object):
         mangling: Optional[Mangling],
         symbol_selection: SymbolSelection,
         source_prefix: Optional[List[str]],
+        gather_source_locations: bool = True,
     ):
         self._binutils = binutils
         self._symbol_type = symbol_type
         self._mangling = mangling
         self._symbol_selection = symbol_selection
+        self._selects_all_symbols: bool = symbol_selection.selectsAllSymbols()
         self._source_prefix = source_prefix
+        self._gather_source_locations = gather_source_locations
 
         self.symbols: Dict[str, Symbol] = {}
         self.num_symbols_dropped: int = 0
@@ -53,8 +67,8 @@ class SymbolExtractor(object):
 
         self.debug_info_available: bool = False
 
-    def _readNMOutput(self, filename: str, extra_flags: List[str]) -> str:
-        """Read the output of the nm command applied to the binary"""
+    def _readNMOutput(self, filename: str, extra_flags: List[str]) -> bytes:
+        """Read the undecoded output of the nm command applied to the binary"""
         if self._binutils.nm_command is None:
             raise Exception(
                 "Binutils nm command unavailable. Unable to extract symbols."
@@ -71,7 +85,36 @@ class SymbolExtractor(object):
 
         cmd.append(filename)
 
-        return runSystemCommand(cmd)
+        return runSystemCommandRaw(cmd, cache_dir=self._binutils.cache_dir)
+
+    def _demangleWithBinutils(
+        self, filename: str, symbol_names_mangled: List[bytes]
+    ) -> List[str]:
+        """Demangle symbol names using binutils
+
+        All symbol names are passed to c++filt at once. If c++filt is unavailable
+        nm is run once more to generate demangled output.
+        """
+        if self._binutils.cxxfilt_command is not None:
+            cxxfilt_output: str = runSystemCommandRaw(
+                # Without -i, c++filt expands standard library abbreviations,
+                # e.g. std::ostream, unlike nm -C.
+                [self._binutils.cxxfilt_command, "-i"],
+                input_=b"\n".join(symbol_names_mangled),
+                cache_dir=self._binutils.cache_dir,
+            ).decode("utf8")
+            symbol_names_demangled: List[str] = cxxfilt_output.splitlines()
+            if len(symbol_names_demangled) == len(symbol_names_mangled):
+                return symbol_names_demangled
+            warning("Unexpected c++filt output. Falling back to nm for demangling.")
+
+        nm_output_demangled: bytes = self._readNMOutput(
+            filename=filename, extra_flags=["-C"]
+        )
+        return [
+            nm_match_demangled.group(3).decode("utf8")
+            for nm_match_demangled in NM_REGEX_DEMANGLED.finditer(nm_output_demangled)
+        ]
 
     def _removeSourcePrefix(self, filename: str) -> str:
         if self._source_prefix is None:
@@ -89,7 +132,9 @@ class SymbolExtractor(object):
         symbol_name_is_demangled: bool,
     ) -> Optional[Symbol]:
         """Generate a symbol based on a symbol name but only if the symbol is intented to be selected."""
-        if self._symbol_selection.isSymbolSelected(symbol_name):
+        if self._selects_all_symbols or self._symbol_selection.isSymbolSelected(
+            symbol_name
+        ):
             return self._symbol_type(
                 symbol_name,
                 symbol_name_mangled,
@@ -125,91 +170,94 @@ class SymbolExtractor(object):
 
     def extractSymbols(self, filename: str) -> None:
         """Gather the properties of a symbol"""
-        nm_output_mangled: str = self._readNMOutput(
-            filename=filename, extra_flags=["--line-numbers"]
+        # Determining source locations requires nm to evaluate the debug information
+        # which is expensive for large binaries
+        nm_output_mangled: bytes = self._readNMOutput(
+            filename=filename,
+            extra_flags=["--line-numbers"] if self._gather_source_locations else [],
         )
-        nm_output_demangled: str = self._readNMOutput(
-            filename=filename, extra_flags=["-C"]
+
+        # Only lines that describe symbols are matched
+        nm_matches_mangled = list(NM_REGEX_MANGLED.finditer(nm_output_mangled))
+        symbol_names_demangled: List[str] = self._demangleWithBinutils(
+            filename=filename,
+            symbol_names_mangled=[
+                nm_match_mangled.group(3) for nm_match_mangled in nm_matches_mangled
+            ],
         )
 
         self.num_symbols_dropped = 0
-        nm_regex_mangled = re.compile(
-            r"^[0-9A-Fa-f]+\s([0-9A-Fa-f]+)\s(\w)\s([^\t]+)(\t(.+))?"
-        )
-        nm_regex_demangled = re.compile(r"^[0-9A-Fa-f]+\s([0-9A-Fa-f]+)\s(\w)\s(.+)")
-        file_line_number_regex = re.compile(r"(.*):(\d+)")
         print("Extracting symbols")
         sys.stdout.flush()
-        lines_mangled = nm_output_mangled.splitlines()
-        lines_demangled = nm_output_demangled.splitlines()
-        for line_mangled, line_demangled in progressbar.progressbar(
-            zip(lines_mangled, lines_demangled), max_value=len(lines_mangled)
+        for (
+            nm_match_mangled,
+            symbol_name_with_mangling_state_unknown,
+        ) in progressbar.progressbar(
+            zip(nm_matches_mangled, symbol_names_demangled),
+            max_value=len(nm_matches_mangled),
         ):
-            nm_match_mangled = re.match(nm_regex_mangled, line_mangled)
-            nm_match_demangled = re.match(nm_regex_demangled, line_demangled)
+            symbol_size: int = int(nm_match_mangled.group(1))
+            symbol_type: str = nm_match_mangled.group(2).decode("utf8")
 
-            if nm_match_mangled and nm_match_demangled:
-                symbol_size_str: str = nm_match_mangled.group(1)
-                symbol_type: str = nm_match_mangled.group(2)
+            symbol_name_mangled: str = nm_match_mangled.group(3).decode("utf8")
 
-                symbol_name_mangled: str = nm_match_mangled.group(3)
-                symbol_name_with_mangling_state_unknown: str = nm_match_demangled.group(
-                    3
-                )
+            symbol_name: str
+            symbol_name_is_demangled: bool
+            (
+                symbol_name,
+                symbol_name_is_demangled,
+            ) = self._demangle(symbol_name_with_mangling_state_unknown)
 
-                symbol_name: str
-                symbol_name_is_demangled: bool
+            source_filename: Optional[str] = None
+            line_number: Optional[int] = None
+            if nm_match_mangled.group(4) is not None:
+                file_and_line_number: str = nm_match_mangled.group(5).decode("utf8")
+                # nm reports source locations as file:line, sometimes followed
+                # by a discriminator, e.g. /some/file.cpp:42 (discriminator 1)
                 (
+                    file_part,
+                    separator,
+                    line_number_part,
+                ) = file_and_line_number.rpartition(":")
+                line_number_str: str = line_number_part.split(" ", 1)[0]
+                if separator and line_number_str.isdecimal():
+                    source_filename = file_part.replace("\\", "/")
+                    line_number = int(line_number_str)
+
+                    if (source_filename is not None) and (
+                        source_filename not in self.source_files.keys()
+                    ):
+                        source_filename_wo_prefix = self._removeSourcePrefix(
+                            source_filename
+                        )
+                        new_source_file = SourceFile(
+                            source_filename, source_filename_wo_prefix
+                        )
+                        self.source_files[new_source_file.id_] = new_source_file
+                        self._file_to_id[source_filename] = new_source_file.id_
+
+            existing_symbol: Optional[Symbol] = self.symbols.get(symbol_name_mangled)
+            if existing_symbol is None:
+                new_symbol: Optional[Symbol] = self._generateSymbol(
                     symbol_name,
+                    symbol_name_mangled,
                     symbol_name_is_demangled,
-                ) = self._demangle(symbol_name_with_mangling_state_unknown)
-
-                source_filename: Optional[str] = None
-                line_number: Optional[int] = None
-                if nm_match_mangled.group(4) is not None:
-                    file_and_line_number = nm_match_mangled.group(5)
-                    file_and_line_number_match = re.match(
-                        file_line_number_regex, file_and_line_number
-                    )
-                    if file_and_line_number_match:
-                        source_filename = file_and_line_number_match.group(1).replace(
-                            "\\", "/"
-                        )
-                        line_number = int(file_and_line_number_match.group(2))
-
-                        if (source_filename is not None) and (
-                            source_filename not in self.source_files.keys()
-                        ):
-                            source_filename_wo_prefix = self._removeSourcePrefix(
-                                source_filename
-                            )
-                            new_source_file = SourceFile(
-                                source_filename, source_filename_wo_prefix
-                            )
-                            self.source_files[new_source_file.id_] = new_source_file
-                            self._file_to_id[source_filename] = new_source_file.id_
-
-                if symbol_name_mangled not in self.symbols.keys():
-                    new_symbol: Optional[Symbol] = self._generateSymbol(
-                        symbol_name,
-                        symbol_name_mangled,
-                        symbol_name_is_demangled,
-                    )
-                    if new_symbol is not None:
-                        new_symbol.size = int(symbol_size_str)
-                        new_symbol.type_ = symbol_type
-
-                        if source_filename is not None:
-                            source_id = self._file_to_id[source_filename]
-                            new_symbol.source_id = source_id
-                            new_symbol.source_line = line_number
-
-                        self.symbols[new_symbol.name_mangled] = new_symbol
-                    # else:
-                    #    print(f"Skipping symbol {symbol_name_mangled}")
-                else:
-                    self.symbols[symbol_name_mangled].size = int(symbol_size_str)
-                    self.symbols[symbol_name_mangled].type_ = symbol_type
+                )
+                if new_symbol is not None:
+                    new_symbol.size = symbol_size
+                    new_symbol.type_ = symbol_type
+
+                    if source_filename is not None:
+                        source_id = self._file_to_id[source_filename]
+                        new_symbol.source_id = source_id
+                        new_symbol.source_line = line_number
+
+                    self.symbols[new_symbol.name_mangled] = new_symbol
+                # else:
+                #    print(f"Skipping symbol {symbol_name_mangled}")
+            else:
+                existing_symbol.size = symbol_size
+                existing_symbol.type_ = symbol_type
 
         if len(self.source_files.keys()) > 0:
             self.debug_info_available = True
@@ -38,16 +38,22 @@ class SymbolSelection(object):
         if symbol_exclusion_regex is not None:
             self.symbol_exclusion_regex_compiled = re.compile(symbol_exclusion_regex)
 
+    def selectsAllSymbols(self) -> bool:
+        """Check if all symbols are selected as neither a selection nor an exclusion regex is defined"""
+        return (self.symbol_selection_regex_compiled is None) and (
+            self.symbol_exclusion_regex_compiled is None
+        )
+
     def isSymbolSelected(self, symbol_name: str) -> bool:
         """Check if a symbol is selected via a regex"""
         if self.symbol_exclusion_regex_compiled is not None:
-            if re.match(self.symbol_exclusion_regex_compiled, symbol_name):
+            if self.symbol_exclusion_regex_compiled.match(symbol_name):
                 return False
 
         if self.symbol_selection_regex_compiled is None:
             return True
 
-        if re.match(self.symbol_selection_regex_compiled, symbol_name):
+        if self.symbol_selection_regex_compiled.match(symbol_name):
             return True
 
         return False
@@ -22,8 +22,6 @@ from elf_diff.system_command import runSystemCommand
 from elf_diff.binutils import Binutils
 from elf_diff.error_handling import warning
 
-import re
-
 
 class SymbolSizes(object):
     def __init__(self, filename: str, binutils: Binutils):
@@ -43,17 +41,28 @@ class SymbolSizes(object):
             warning("No binutils size command available. Unable to read symbol sizes")
             return
 
-        size_output: str = runSystemCommand([binutils.size_command, filename])
+        size_output: str = runSystemCommand(
+            [binutils.size_command, filename], cache_dir=binutils.cache_dir
+        )
 
-        size_re = re.compile(r"^\s*([0-9]+)\s+([0-9]+)\s+([0-9]+)\s+([0-9]+)")
+        # The first line that starts with four numbers (text, data, bss, dec)
+        # is of interest
         for line in size_output.splitlines():
-            size_match = re.match(size_re, line)
-            if size_match:
-                self.text_size = int(size_match.group(1))
-                self.data_size = int(size_match.group(2))
-                self.bss_size = int(size_match.group(3))
-                self.overall_size = int(size_match.group(4))
-
-                self.progmem_size = self.text_size + self.data_size
-                self.static_ram_size = self.data_size + self.bss_size
-                break
+            columns = line.split()
+            if len(columns) < 4:
+                continue
+            try:
+                text_size, data_size, bss_size, overall_size = (
+                    int(column) for column in columns[:4]
+                )
+            except ValueError:
+                continue
+
+            self.text_size = text_size
+            self.data_size = data_size
+            self.bss_size = bss_size
+            self.overall_size = overall_size
+
+            self.progmem_size = self.text_size + self.data_size
+            self.static_ram_size = self.data_size + self.bss_size
+            break
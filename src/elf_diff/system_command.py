@@ -18,19 +18,176 @@
 # You should have received a copy of the GNU General Public License along with along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 #
-from typing import List
+from elf_diff.error_handling import warning
+
+from typing import List, Iterator, Optional, BinaryIO
 import subprocess  # nosec # silence bandid warning
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+# Buffer size used when streaming the output of a system command
+STREAM_BUFFER_SIZE = 1024 * 1024
+
+# Seconds to wait before checking for more output of a background command
+SPOOL_POLL_INTERVAL = 0.01
+
+# Cached command output can become large. Favor speed over compression ratio.
+CACHE_COMPRESSION_LEVEL = 1
+
+
+def _getCacheFilename(
+    cache_dir: str, cmd: List[str], input_: Optional[bytes] = None
+) -> str:
+    """Return the name of the file that caches the output of a command
+
+    Arguments that are files (the binary and the command itself) contribute
+    their modification time and size to the key, so that cached output
+    is invalidated when they change.
+    """
+    key = hashlib.sha256()
+    for arg in cmd:
+        if os.path.isfile(arg):
+            stat: os.stat_result = os.stat(arg)
+            arg = f"{os.path.abspath(arg)}:{stat.st_mtime_ns}:{stat.st_size}"
+        key.update(arg.encode("utf8"))
+        key.update(b"\0")
+    if input_ is not None:
+        key.update(input_)
+    return os.path.join(cache_dir, key.hexdigest() + ".gz")
 
 
-def runSystemCommand(cmd: List[str]) -> str:
-    """Read the output of the objdump command applied to the binary"""
-    proc = subprocess.Popen(  # nosec # silence bandid warning
-        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+def _addToCache(cache_filename: str, output: BinaryIO) -> None:
+    """Compress command output into the cache, only warn if this fails"""
+    # The output is written to a temporary file first, so that an
+    # incomplete cache file is never read.
+    tmp_filename: str = f"{cache_filename}.{os.getpid()}.tmp"
+    try:
+        with gzip.open(
+            tmp_filename, "wb", compresslevel=CACHE_COMPRESSION_LEVEL
+        ) as cache_file:
+            shutil.copyfileobj(output, cache_file, STREAM_BUFFER_SIZE)
+        os.replace(tmp_filename, cache_filename)
+    except OSError as e:
+        warning(f"Unable to cache command output in {cache_filename}: {e}")
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+
+
+def runSystemCommandRaw(
+    cmd: List[str], input_: Optional[bytes] = None, cache_dir: Optional[str] = None
+) -> bytes:
+    """Read the undecoded output of a command, optionally from a cache directory"""
+    cache_filename: Optional[str] = None
+    if cache_dir is not None:
+        cache_filename = _getCacheFilename(cache_dir, cmd, input_)
+        if os.path.isfile(cache_filename):
+            with gzip.open(cache_filename, "rb") as cache_file:
+                return cache_file.read()
+
+    # stderr is never evaluated. Discarding it instead of piping it saves
+    # a pipe that would otherwise have to be drained.
+    proc = subprocess.run(  # nosec # silence bandid warning
+        cmd,
+        input=input_,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=False,
     )
 
-    o, e = proc.communicate()  # pylint: disable=unused-variable
+    if (cache_filename is not None) and (proc.returncode == 0):
+        _addToCache(cache_filename, io.BytesIO(proc.stdout))
 
-    output: str = o.decode("utf8")
-    # error = e.decode('utf8')
+    return proc.stdout
+
+
+def runSystemCommand(cmd: List[str], cache_dir: Optional[str] = None) -> str:
+    """Read the output of a command"""
+    output: str = runSystemCommandRaw(cmd, cache_dir=cache_dir).decode("utf8")
 
     return output
+
+
+class BackgroundSystemCommand(object):
+    """A command that runs in the background while its output is spooled to a temporary file
+
+    If a cache directory is given, output is read from the cache or
+    added to it once the command has finished successfully.
+    """
+
+    def __init__(self, cmd: List[str], cache_dir: Optional[str] = None):
+        self._cache_filename: Optional[str] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._output_filename: Optional[str] = None
+
+        if cache_dir is not None:
+            self._cache_filename = _getCacheFilename(cache_dir, cmd)
+            if os.path.isfile(self._cache_filename):
+                return
+
+        # The command writes its output directly to the file. It thus runs to
+        # completion, independent of how fast its output is consumed.
+        fd, self._output_filename = tempfile.mkstemp(prefix="elf_diff_")
+        with os.fdopen(fd, "wb") as output_file:
+            self._proc = subprocess.Popen(  # nosec # silence bandid warning
+                cmd,
+                stdout=output_file,
+                stderr=subprocess.DEVNULL,
+            )
+
+    def streamOutput(self) -> Iterator[str]:
+        """Read the output line by line, following it while the command is still running"""
+        if self._proc is None:
+            assert self._cache_filename is not None  # nosec # silence bandid warning
+            with gzip.open(self._cache_filename, "rt", encoding="utf8") as cache_file:
+                for line in cache_file:
+                    yield line.rstrip("\n")
+            return
+
+        assert self._output_filename is not None  # nosec # silence bandid warning
+        with open(self._output_filename, "rb") as output_file:
+            pending: bytes = b""
+            while True:
+                running: bool = self._proc.poll() is None
+                chunk: bytes = output_file.read(STREAM_BUFFER_SIZE)
+                if not chunk:
+                    if not running:
+                        break
+                    time.sleep(SPOOL_POLL_INTERVAL)
+                    continue
+
+                # Only complete lines are decoded. A newline byte is never
+                # part of a multi-byte utf8 character.
+                pending += chunk
+                end: int = pending.rfind(b"\n") + 1
+                if end == 0:
+                    continue
+                text: str = pending[:end].decode("utf8")
+                pending = pending[end:]
+                if "\r" in text:
+                    text = text.replace("\r\n", "\n")
+                yield from text.split("\n")[:-1]
+
+            if pending:
+                yield pending.decode("utf8").rstrip("\r")
+
+    def close(self) -> None:
+        """Stop the command if it is still running and remove its output"""
+        if (self._proc is None) or (self._output_filename is None):
+            return
+
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+
+        try:
+            # Only output of commands that were run to completion successfully is cached
+            if (self._cache_filename is not None) and (self._proc.returncode == 0):
+                with open(self._output_filename, "rb") as output_file:
+                    _addToCache(self._cache_filename, output_file)
+        finally:
+            os.remove(self._output_filename)
@@ -76,12 +76,28 @@ class TestCommandLineArgs(ElfDiffExecutionMixin, TestCaseWithSubdirs):
     def test_bin_prefix2(self):
         self.runSimpleTestArm([("bin_prefix", "___bad_prefix___")])
 
+    def test_binutils_cache_dir(self):
+        # The second run reads the output that the first run cached
+        for _ in range(2):
+            self.runSimpleTest([("binutils_cache_dir", "binutils_cache")])
+            self.assertTrue(len(os.listdir("binutils_cache")) > 0)
+
     def test_build_info(self):
         self.runSimpleTest([("build_info", "Some buildinfo string")])
 
     def test_consider_equal_sized_identical(self):
         self.runSimpleTest([("consider_equal_sized_identical", None)])
 
+    def test_cxxfilt_command(self):
+        self.runSimpleTest(
+            [
+                (
+                    "cxxfilt_command",
+                    os.path.join(STANDARD_BIN_DIR, f"c++filt{EXE_SUFFIX}"),
+                )
+            ]
+        )
+
     def test_driver_file(self):
 
         elf_diff_test_yaml_file = "pair_report.elf_diff_test.yml"
@@ -373,6 +389,9 @@ class TestCommandLineArgs(ElfDiffExecutionMixin, TestCaseWithSubdirs):
     def test_skip_persisting_same_size(self):
         self.runSimpleTest([("skip_persisting_same_size", None)])
 
+    def test_skip_source_locations(self):
+        self.runSimpleTest([("skip_source_locations", None)])
+
     def test_skip_symbol_similarities(self):
         self.runSimpleTest([("skip_symbol_similarities", None)])
 
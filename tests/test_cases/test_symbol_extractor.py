@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+# -*- mode: python -*-
+#
+# elf_diff
+#
+# Copyright (C) 2021  Noseglasses (shinynoseglasses@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+#
+from elf_diff_test.test_binaries import getTestBinary
+
+from elf_diff.binutils import Binutils
+from elf_diff.symbol import CppSymbol
+from elf_diff.symbol_extractor import SymbolExtractor
+from elf_diff.symbol_selection import SymbolSelection
+
+import os
+import shutil
+import subprocess  # nosec # silence bandid warning
+import tempfile
+import unittest
+from typing import Dict, List, Optional, Tuple
+
+
+class TestSymbolExtractor(unittest.TestCase):
+    def _extractSymbolNames(self, binutils: Binutils) -> Dict[str, Tuple[str, bool]]:
+        """Extract the demangled names of the symbols of a test binary"""
+        symbol_extractor = SymbolExtractor(
+            binutils=binutils,
+            symbol_type=CppSymbol,
+            mangling=None,
+            symbol_selection=SymbolSelection(None, None),
+            source_prefix=None,
+        )
+        symbol_extractor.extractSymbols(getTestBinary("x86_64", "test", "debug", "old"))
+        return {
+            name_mangled: (symbol.name, symbol.is_demangled)
+            for name_mangled, symbol in symbol_extractor.symbols.items()
+        }
+
+    def _demangleInObject(self, binutils: Binutils, symbol_name: str) -> List[str]:
+        """Demangle a symbol name defined by an object file that is assembled on the fly"""
+        as_command: Optional[str] = shutil.which("as")
+        if as_command is None:
+            self.skipTest("requires the host assembler")
+
+        symbol_extractor = SymbolExtractor(
+            binutils=binutils,
+            symbol_type=CppSymbol,
+            mangling=None,
+            symbol_selection=SymbolSelection(None, None),
+            source_prefix=None,
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            object_filename = os.path.join(tmp_dir, "symbol.o")
+            subprocess.run(  # nosec # silence bandid warning
+                [as_command, "-o", object_filename],
+                input=(
+                    f".data\n.globl {symbol_name}\n{symbol_name}:\n.byte 0\n"
+                    f".size {symbol_name}, 1\n"
+                ).encode("utf8"),
+                check=True,
+            )
+            return symbol_extractor._demangleWithBinutils(
+                object_filename, [symbol_name.encode("utf8")]
+            )
+
+    def testDemanglingStandardLibraryAbbreviations(self):
+        binutils = Binutils()
+        binutils.initialize({}, bin_prefix=None, bin_dir=None)
+        self.assertIsNotNone(binutils.cxxfilt_command)
+        self.assertEqual(
+            self._demangleInObject(binutils, "_Z1gRSo"), ["g(std::ostream&)"]
+        )
+
+        # nm -C must yield the same name as c++filt
+        binutils.cxxfilt_command = None
+        self.assertEqual(
+            self._demangleInObject(binutils, "_Z1gRSo"), ["g(std::ostream&)"]
+        )
+
+    def testDemanglingWithoutCxxfilt(self):
+        binutils = Binutils()
+        binutils.initialize({}, bin_prefix=None, bin_dir=None)
+        self.assertIsNotNone(binutils.cxxfilt_command)
+        symbol_names_cxxfilt = self._extractSymbolNames(binutils)
+
+        # Without c++filt, nm demangles the symbol names
+        binutils.cxxfilt_command = None
+        symbol_names_nm = self._extractSymbolNames(binutils)
+
+        self.assertEqual(symbol_names_nm["_Z4funci"], ("func(int)", True))
+        self.assertEqual(symbol_names_nm, symbol_names_cxxfilt)
+
+    def testCachedExtraction(self):
+        binutils = Binutils()
+        binutils.initialize({}, bin_prefix=None, bin_dir=None)
+        symbol_names_uncached = self._extractSymbolNames(binutils)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = os.path.join(tmp_dir, "cache")
+            binutils.initialize({}, bin_prefix=None, bin_dir=None, cache_dir=cache_dir)
+            self.assertEqual(binutils.cache_dir, cache_dir)
+
+            # The first run fills the cache, the second one reads from it
+            for _ in range(2):
+                self.assertEqual(
+                    self._extractSymbolNames(binutils), symbol_names_uncached
+                )
+                self.assertNotEqual(os.listdir(cache_dir), [])
+
+    def testUnusableCacheDir(self):
+        binutils = Binutils()
+        with tempfile.NamedTemporaryFile() as cache_file:
+            # A cache directory that cannot be created disables caching
+            binutils.initialize(
+                {}, bin_prefix=None, bin_dir=None, cache_dir=cache_file.name
+            )
+            self.assertIsNone(binutils.cache_dir)
+            self.assertIn("_Z4funci", self._extractSymbolNames(binutils))
+
+    @unittest.skipIf(os.name == "nt", "requires symbolic links")
+    def testCxxfiltNextToExplicitNm(self):
+        host_nm_command: Optional[str] = shutil.which("nm")
+        host_cxxfilt_command: Optional[str] = shutil.which("c++filt")
+        if (host_nm_command is None) or (host_cxxfilt_command is None):
+            self.skipTest("requires host nm and c++filt")
+
+        with tempfile.TemporaryDirectory() as bin_dir:
+            nm_command = os.path.join(bin_dir, "nm")
+            os.symlink(host_nm_command, nm_command)
+
+            # The host c++filt must not be used with an explicitly defined nm
+            binutils = Binutils()
+            binutils.initialize({"nm_command": nm_command}, None, None)
+            self.assertIsNone(binutils.cxxfilt_command)
+
+            cxxfilt_command = os.path.join(bin_dir, "c++filt")
+            os.symlink(host_cxxfilt_command, cxxfilt_command)
+
+            binutils = Binutils()
+            binutils.initialize({"nm_command": nm_command}, None, None)
+            self.assertEqual(binutils.cxxfilt_command, cxxfilt_command)